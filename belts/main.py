@@ -14,29 +14,67 @@ Implements:
 
 import sys
 import json
-import networkx as nx
-from typing import Dict, Any, List, Tuple, Set
-from collections import defaultdict
+import math
+import importlib.util
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, maximum_flow
+from typing import Dict, Any, List, Optional, Tuple, Set
+
+# optional native (C++/Boost) push-relabel backend, imported only for large networks
+HAVE_GRAPH_TOOL = importlib.util.find_spec("graph_tool") is not None
+
+try:  # optional C JSON codec for stdin/stdout
+    import orjson
+except ImportError:
+    orjson = None
 
 EPS = 1e-9
+INT32_MAX = np.iinfo(np.int32).max
+MAX_FLOW_SCALE = 1e6  # fixed-point multiplier for SciPy's integer capacities
+PUSH_RELABEL_MIN_EDGES = 2000  # below this, Dinic's lower setup cost wins
 
 
 class FlowGraph:
-    """Encapsulates a directed flow network with bounds, node capacities, and supply/sink structure."""
+    """
+    Encapsulates a directed flow network with bounds, node capacities, and supply/sink structure.
+
+    Edges are stored struct-of-arrays style: parallel NumPy arrays of endpoint ids
+    (`u_ids`, `v_ids`) and bounds (`lo`, `hi`). `names` maps every node id to its
+    base node name; split nodes share the name of the node they were split from,
+    so `name2id` only resolves input names (to the inbound half of a split node).
+    """
 
     def __init__(self):
-        self.graph = nx.DiGraph()
         self.sources: Dict[str, float] = {}
         self.sink: str | None = None
         self.node_caps: Dict[str, float] = {}
-        self.edge_meta: Dict[Tuple[str, str], Dict[str, float]] = {}
-        self.orig_edges: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.names: List[str] = []
+        self.name2id: Dict[str, int] = {}
+        self.u_ids = np.empty(0, dtype=np.int32)
+        self.v_ids = np.empty(0, dtype=np.int32)
+        self.lo = np.empty(0)
+        self.hi = np.empty(0)
+
+    def node_id(self, name: str) -> int:
+        """Return the id of a node, interning it on first use."""
+        if name not in self.name2id:
+            self.name2id[name] = len(self.names)
+            self.names.append(name)
+        return self.name2id[name]
+
+    def add_edges(self, us: List[str], vs: List[str], lo: List[float], hi: List[float]):
+        """Append a batch of edges with lower and upper flow bounds."""
+        u_ids = np.array([self.node_id(u) for u in us], dtype=np.int32)
+        v_ids = np.array([self.node_id(v) for v in vs], dtype=np.int32)
+        self.u_ids = np.concatenate((self.u_ids, u_ids))
+        self.v_ids = np.concatenate((self.v_ids, v_ids))
+        self.lo = np.concatenate((self.lo, np.asarray(lo, dtype=float)))
+        self.hi = np.concatenate((self.hi, np.asarray(hi, dtype=float)))
 
     def add_edge(self, u: str, v: str, lo: float, hi: float):
         """Insert edge with lower and upper flow bounds."""
-        self.graph.add_edge(u, v, capacity=hi, lower=lo)
-        self.edge_meta[(u, v)] = {"lo": lo, "hi": hi}
-        self.orig_edges[(u, v)] = {"lo": lo, "hi": hi}
+        self.add_edges([u], [v], [lo], [hi])
 
     def add_node_capacity(self, node: str, cap: float):
         """Add node capacity constraint."""
@@ -50,81 +88,316 @@ class FlowGraph:
         """Designate a node as the global sink."""
         self.sink = node
 
+    def copy_structure(self) -> "FlowGraph":
+        """Shallow copy of the node table, sources, sink, and capacities (edges are shared)."""
+        new = FlowGraph()
+        new.sources = self.sources.copy()
+        new.sink = self.sink
+        new.node_caps = self.node_caps.copy()
+        new.names = self.names.copy()
+        new.name2id = self.name2id.copy()
+        new.u_ids, new.v_ids, new.lo, new.hi = self.u_ids, self.v_ids, self.lo, self.hi
+        return new
+
     def nodes(self) -> Set[str]:
-        return set(self.graph.nodes())
+        return set(self.names)
 
     def edges(self) -> List[Tuple[str, str]]:
-        return list(self.graph.edges())
+        names = self.names
+        return [(names[u], names[v]) for u, v in zip(self.u_ids.tolist(), self.v_ids.tolist())]
+
+
+def capacity_unit(caps: np.ndarray) -> Optional[float]:
+    """
+    A unit every capacity is a whole multiple of (to within an absolute EPS), when
+    there is an obvious one: the gcd of all-integer capacities, otherwise the
+    smallest positive capacity.
+    """
+    pos = caps[caps > EPS]
+    if not len(pos):
+        return None
+    whole = np.rint(pos)
+    if np.all(np.abs(pos - whole) <= EPS):
+        return float(np.gcd.reduce(whole.astype(np.int64)))
+    unit = float(pos.min())
+    if np.all(np.abs(pos - unit * np.rint(pos / unit)) <= EPS):
+        return unit
+    return None
+
+
+def flow_bound(u_ids: np.ndarray, caps: np.ndarray, s: int) -> float:
+    """Upper bound on the s-t flow value: the total capacity leaving `s`."""
+    out = caps[u_ids == s]
+    if np.all(np.isfinite(out)):
+        return float(out.sum())
+    return float(caps[np.isfinite(caps)].sum()) + 1.0
+
+
+def dinic_flows(n: int, u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                s: int, t: int) -> np.ndarray:
+    """
+    Per-edge s-t flow via SciPy's Dinic implementation.
+
+    SciPy requires int32 capacities, so every capacity (infinite ones included) is
+    clamped to the flow bound out of `s`. If the clamped capacities are whole
+    multiples of a common unit (see `capacity_unit`), they are solved in that
+    unit and scaled back exactly. Otherwise they are scaled to fixed point by the
+    largest power of ten (at most MAX_FLOW_SCALE) that keeps the bound in range
+    and rounded down, so the result is always a feasible flow of the exact
+    network, possibly short of the maximum by up to one quantum per edge;
+    `augment_flows` closes that gap.
+    """
+    bound = flow_bound(u_ids, caps, s)
+    clamped = np.minimum(caps, bound)
+    unit = capacity_unit(clamped)
+    exact = unit is not None and bound / unit <= INT32_MAX / 2
+    if exact:
+        caps_q = np.rint(clamped / unit).astype(np.int32)
+    else:
+        scale = min(MAX_FLOW_SCALE, 10.0 ** math.floor(math.log10(INT32_MAX / (2 * max(bound, 1.0)))))
+        caps_q = np.floor(clamped * scale).astype(np.int32)
+
+    graph = csr_matrix((caps_q, (u_ids, v_ids)), shape=(n, n))
+    result = maximum_flow(graph, s, t, method="dinic")
+
+    net = np.maximum(np.asarray(result.flow[u_ids, v_ids]).ravel(), 0)
+    return np.minimum(net * unit if exact else net / scale, caps)
+
+
+def push_relabel_flows(n: int, u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                       s: int, t: int) -> np.ndarray:
+    """Per-edge maximum flow via graph-tool's push-relabel (floating-point capacities)."""
+    import graph_tool
+    from graph_tool.flow import push_relabel_max_flow
+
+    finite = np.isfinite(caps)
+    bound = float(caps[finite].sum()) + 1.0
+
+    g = graph_tool.Graph(directed=True)
+    g.add_vertex(n)
+    g.add_edge_list(np.column_stack((u_ids, v_ids)))
+    cap = g.new_edge_property("double")
+    cap.a = np.where(finite, caps, bound)
+
+    residual = push_relabel_max_flow(g, g.vertex(s), g.vertex(t), cap)
+    return np.minimum(cap.a - residual.a, caps)
+
+
+def augment_flows(n: int, u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                  flows: np.ndarray, s: int, t: int) -> np.ndarray:
+    """
+    Complete a feasible flow to a maximum one with floating-point augmenting
+    paths, shortest first as in Edmonds-Karp, over the exact residual graph.
+
+    Starting from a backend's (near-)maximum flow this usually takes only a few
+    breadth-first searches, and it makes the result exact to EPS whatever
+    precision the backend worked in.
+    """
+    flows = flows.copy()
+    edge_of = {uv: i for i, uv in enumerate(zip(u_ids.tolist(), v_ids.tolist()))}
+
+    def slack(u: int, v: int) -> float:
+        """Residual capacity u -> v: spare forward capacity plus cancellable reverse flow."""
+        i, j = edge_of.get((u, v)), edge_of.get((v, u))
+        return (caps[i] - flows[i] if i is not None else 0.0) + (flows[j] if j is not None else 0.0)
+
+    while True:
+        fwd = caps - flows > EPS
+        back = flows > EPS
+        rows = np.concatenate((u_ids[fwd], v_ids[back]))
+        cols = np.concatenate((v_ids[fwd], u_ids[back]))
+        residual = csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, n))
+        _, pred = breadth_first_order(residual, s, directed=True, return_predecessors=True)
+        if pred[t] < 0:
+            return flows
+
+        path, v = [], t
+        while v != s:
+            path.append((int(pred[v]), v))
+            v = int(pred[v])
+        delta = min(slack(u, v) for u, v in path)
+        if not math.isfinite(delta):
+            return flows
+
+        for u, v in path:
+            i, j = edge_of.get((u, v)), edge_of.get((v, u))
+            rest = delta
+            if j is not None:
+                cancel = min(rest, flows[j])
+                flows[j] -= cancel
+                rest -= cancel
+            if rest > 0 and i is not None:
+                flows[i] += rest
+
+
+def max_flow(n: int, u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+             s: int, t: int) -> Tuple[float, np.ndarray]:
+    """
+    Compute a maximum s-t flow over id-indexed edge arrays.
+
+    Large networks use graph-tool's push-relabel when it is installed; everything
+    else runs SciPy's Dinic. Either result is then completed in floating point by
+    `augment_flows`, so the flow is maximum to EPS. Edges must be unique (u, v) pairs.
+
+    Returns the flow value and the per-edge flow aligned with the input arrays.
+    """
+    if HAVE_GRAPH_TOOL and len(caps) >= PUSH_RELABEL_MIN_EDGES:
+        flows = push_relabel_flows(n, u_ids, v_ids, caps, s, t)
+    else:
+        flows = dinic_flows(n, u_ids, v_ids, caps, s, t)
+    flows = augment_flows(n, u_ids, v_ids, caps, flows, s, t)
+
+    value = float(flows[u_ids == s].sum() - flows[v_ids == s].sum())
+    return value, flows
+
+
+def find_tight_edges(u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                     flows: np.ndarray, in_reach: np.ndarray) -> np.ndarray:
+    """
+    Indices of saturated edges crossing a cut from the reachable side.
+
+    `in_reach` is a boolean mask over node ids; a single vectorized pass over the
+    edge arrays.
+    """
+    return np.flatnonzero(in_reach[u_ids] & ~in_reach[v_ids] & (np.abs(flows - caps) < EPS))
+
+
+def append_edges(u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                 new_u: np.ndarray, new_v: np.ndarray, new_caps: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate extra (u, v, capacity) edges onto id-indexed edge arrays."""
+    return (np.concatenate((u_ids, new_u)).astype(np.int32),
+            np.concatenate((v_ids, new_v)).astype(np.int32),
+            np.concatenate((caps, new_caps)).astype(float))
+
+
+def cut_certificate(names: List[str], u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                    flows: np.ndarray, reach: List[int]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Node names on the reachable side of a cut, and its saturated crossing edges.
+
+    The two halves of a split node share its name (the inbound half keeps the
+    original id, the outbound half has a later one); they are reported as
+    `<node>_in` and `<node>_out`, and the internal edge between them as
+    `<node>_in -> <node>_out`, so the certificate names the binding node cap.
+    """
+    first_id, halves = {}, {}
+    for i, name in enumerate(names):
+        if name in first_id:
+            halves[first_id[name]], halves[i] = f"{name}_in", f"{name}_out"
+        else:
+            first_id[name] = i
+    in_reach = np.zeros(len(names), dtype=bool)
+    in_reach[reach] = True
+    tight = []
+    for i in find_tight_edges(u_ids, v_ids, caps, flows, in_reach).tolist():
+        u, v = int(u_ids[i]), int(v_ids[i])
+        src, dst = names[u], names[v]
+        if u != v and src == dst:
+            src, dst = f"{src}_in", f"{dst}_out"
+        tight.append({"from": src, "to": dst, "capacity": round(float(caps[i]), 4)})
+    return sorted({halves.get(n, names[n]) for n in reach}), tight
+
+
+def min_cut_source_side(n: int, u_ids: np.ndarray, v_ids: np.ndarray, caps: np.ndarray,
+                        flows: np.ndarray, t: int) -> List[int]:
+    """
+    Source side of a minimum cut, read off the residual graph of a maximum flow
+    instead of solving a second flow problem: every node that cannot reach `t`
+    through residual edges (found by a BFS from `t` over reversed residual edges).
+    """
+    fwd = caps - flows > EPS
+    back = flows > EPS
+    # Residual edges u -> v stored reversed (row v, col u) so the BFS runs toward t
+    rows = np.concatenate((v_ids[fwd], u_ids[back]))
+    cols = np.concatenate((u_ids[fwd], v_ids[back]))
+    reversed_residual = csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, n))
+
+    sink_side = np.zeros(n, dtype=bool)
+    sink_side[breadth_first_order(reversed_residual, t, directed=True, return_predecessors=False)] = True
+    return np.flatnonzero(~sink_side).tolist()
 
 
 def split_nodes_for_capacity(base: FlowGraph) -> FlowGraph:
-    """Perform node-splitting transformation for node capacity constraints."""
-    new = FlowGraph()
-    new.sources = base.sources.copy()
-    new.sink = base.sink
-
-    split = {n for n in base.node_caps if n not in base.sources and n != base.sink}
-
-    for u, v in base.edges():
-        e = base.edge_meta[(u, v)]
-        lo, hi = e["lo"], e["hi"]
-        u_out = f"{u}_out" if u in split else u
-        v_in = f"{v}_in" if v in split else v
-        new.add_edge(u_out, v_in, lo, hi)
-
-    for node in split:
-        cap = base.node_caps[node]
-        new.add_edge(f"{node}_in", f"{node}_out", 0, cap)
-
+    """
+    Perform node-splitting transformation for node capacity constraints.
+
+    Each capped node keeps its id as the inbound half and gets a fresh id for the
+    outbound half; its outgoing edges are rewired to the new id and an internal
+    in -> out edge carries the capacity. The original edges keep their positions,
+    so edge i of the result still corresponds to edge i of `base`.
+
+    Nodes whose incoming (or outgoing) edge capacities already sum to at most
+    their cap can never exceed it and are left unsplit.
+    """
+    new = base.copy_structure()
+
+    n = len(base.names)
+    throughput = np.minimum(np.bincount(base.v_ids, base.hi, minlength=n),
+                            np.bincount(base.u_ids, base.hi, minlength=n))
+    split = [base.name2id[node] for node, cap in base.node_caps.items()
+             if node in base.name2id and node not in base.sources and node != base.sink
+             and throughput[base.name2id[node]] > cap + EPS]
+    in_ids = np.array(split, dtype=np.int32)
+    out_ids = np.arange(len(base.names), len(base.names) + len(split), dtype=np.int32)
+    new.names += [base.names[i] for i in split]
+
+    out_of = np.arange(len(base.names), dtype=np.int32)
+    out_of[in_ids] = out_ids
+    caps = [base.node_caps[base.names[i]] for i in split]
+
+    new.u_ids = np.concatenate((out_of[base.u_ids], in_ids))
+    new.v_ids = np.concatenate((base.v_ids, out_ids))
+    new.lo = np.concatenate((base.lo, np.zeros(len(split))))
+    new.hi = np.concatenate((base.hi, np.asarray(caps, dtype=float)))
     return new
 
 
-def transform_lower_bounds(base: FlowGraph) -> Tuple[FlowGraph, Dict[str, float]]:
-    """Shift lower bounds out of the system and record node imbalances."""
-    transformed = FlowGraph()
-    transformed.sources = base.sources.copy()
-    transformed.sink = base.sink
-    transformed.node_caps = base.node_caps.copy()
-
-    imbalance = defaultdict(float)
-    for (u, v), meta in base.edge_meta.items():
-        lo, hi = meta["lo"], meta["hi"]
-        transformed.add_edge(u, v, 0, hi - lo)
-        if lo > EPS:
-            imbalance[u] -= lo
-            imbalance[v] += lo
+def transform_lower_bounds(base: FlowGraph) -> Tuple[FlowGraph, np.ndarray]:
+    """Shift lower bounds out of the system and return the dense per-node imbalance."""
+    transformed = base.copy_structure()
+    transformed.lo = np.zeros_like(base.lo)
+    transformed.hi = base.hi - base.lo
 
-    return transformed, dict(imbalance)
+    n = len(base.names)
+    lo_pos = np.where(base.lo > EPS, base.lo, 0.0)
+    imb = np.bincount(base.v_ids, lo_pos, minlength=n) - np.bincount(base.u_ids, lo_pos, minlength=n)
 
+    return transformed, imb
 
-def build_auxiliary_graph(flow: FlowGraph, imbalance: Dict[str, float]) -> Tuple[nx.DiGraph, str, str, float]:
-    """Construct auxiliary graph for feasibility test."""
-    aux = nx.DiGraph()
-    for u, v in flow.graph.edges():
-        aux.add_edge(u, v, capacity=flow.graph[u][v].get("capacity", float("inf")))
 
+def build_auxiliary_graph(flow: FlowGraph, imb: np.ndarray) -> Tuple[List[str], np.ndarray, np.ndarray,
+                                                                    np.ndarray, int, int, float]:
+    """Construct auxiliary graph for feasibility test as id-indexed edge arrays."""
     S, T = "__super_source__", "__super_sink__"
-    total = 0.0
+    names = flow.names + [S, T]
+    s_id, t_id = len(flow.names), len(flow.names) + 1
 
-    for n, b in imbalance.items():
-        if b > EPS:
-            aux.add_edge(S, n, capacity=b)
-            total += b
-        elif b < -EPS:
-            aux.add_edge(n, T, capacity=-b)
+    supply, demand = np.flatnonzero(imb > EPS), np.flatnonzero(imb < -EPS)
 
-    return aux, S, T, total
+    us, vs, caps = append_edges(flow.u_ids, flow.v_ids, flow.hi,
+                                np.concatenate((np.full(len(supply), s_id), demand)),
+                                np.concatenate((supply, np.full(len(demand), t_id))),
+                                np.concatenate((imb[supply], -imb[demand])))
+    total = float(imb[supply].sum())
+
+    return names, us, vs, caps, s_id, t_id, total
 
 
 def parse_input(data: Dict[str, Any]) -> FlowGraph:
     """Parse JSON input into a FlowGraph."""
     g = FlowGraph()
 
+    bounds: Dict[Tuple[str, str], Tuple[float, float]] = {}
     for e in data.get("edges", []):
         u, v = e["from"], e["to"]
         lo = e.get("lower_bound", e.get("lo", 0))
         hi = e.get("capacity", e.get("hi", float("inf")))
-        g.add_edge(u, v, lo, hi)
+        bounds[(u, v)] = (lo, hi)
+
+    # Load edges in (from, to) order so results come out already sorted
+    edges = sorted(bounds.items())
+    g.add_edges([u for (u, _), _ in edges], [v for (_, v), _ in edges],
+                [lo for _, (lo, _) in edges], [hi for _, (_, hi) in edges])
 
     node_caps = data.get("node_caps", {})
     for n, c in node_caps.items():
@@ -160,34 +433,26 @@ def basic_validity_check(g: FlowGraph) -> Tuple[bool, str]:
     return True, ""
 
 
-def check_feasibility(flow: FlowGraph, imbalance: Dict[str, float]) -> Tuple[bool, Dict[str, Any]]:
+def check_feasibility(flow: FlowGraph, imb: np.ndarray) -> Tuple[bool, Dict[str, Any]]:
     """Check feasibility of the network after lower-bound adjustment."""
-    if not imbalance or all(abs(b) < EPS for b in imbalance.values()):
+    if np.all(np.abs(imb) <= EPS):
         return True, {}
 
-    aux, S, T, demand = build_auxiliary_graph(flow, imbalance)
+    names, us, vs, caps, s_id, t_id, demand = build_auxiliary_graph(flow, imb)
 
     try:
-        value, fdict = nx.maximum_flow(aux, S, T)
-    except nx.NetworkXError as e:
+        value, flows = max_flow(len(names), us, vs, caps, s_id, t_id)
+    except ValueError as e:
         return False, {"error": str(e)}
 
     if abs(value - demand) < EPS:
         return True, {}
 
-    cut_val, (reach, nonreach) = nx.minimum_cut(aux, S, T)
-    reach = [n for n in reach if n not in {S, T}]
-
-    tight = []
-    for u in reach:
-        for v in nonreach:
-            if aux.has_edge(u, v):
-                cap = aux[u][v]["capacity"]
-                if abs(fdict.get(u, {}).get(v, 0) - cap) < EPS:
-                    tight.append({"from": u, "to": v, "capacity": round(cap, 4)})
+    reach = [n for n in min_cut_source_side(len(names), us, vs, caps, flows, t_id) if n != s_id]
+    cut_reachable, tight = cut_certificate(names, us, vs, caps, flows, reach)
 
     return False, {
-        "cut_reachable": sorted(reach),
+        "cut_reachable": cut_reachable,
         "deficit": {"demand_balance": round(demand - value, 4), "tight_edges": tight}
     }
 
@@ -195,94 +460,106 @@ def check_feasibility(flow: FlowGraph, imbalance: Dict[str, float]) -> Tuple[boo
 def solve_belts(data: Dict[str, Any]) -> Dict[str, Any]:
     """Main solver for belt flow feasibility and throughput optimization."""
     try:
-        g = parse_input(data)
+        base = parse_input(data)
     except Exception as e:
         return {"status": "error", "message": f"Failed to parse input: {e}"}
 
-    ok, msg = basic_validity_check(g)
+    ok, msg = basic_validity_check(base)
     if not ok:
         return {"status": "error", "message": msg}
 
-    if g.node_caps:
-        g = split_nodes_for_capacity(g)
+    g = split_nodes_for_capacity(base) if base.node_caps else base
 
     g2, imb = transform_lower_bounds(g)
     feasible, cert = check_feasibility(g2, imb)
     if not feasible:
         return {"status": "infeasible", **cert}
 
-    flow = nx.DiGraph()
-    for u, v in g2.graph.edges():
-        flow.add_edge(u, v, capacity=g2.graph[u][v].get("capacity", float("inf")))
-
-    unified_source = "__source__"
-    total_supply = 0.0
-    for s, val in g2.sources.items():
-        flow.add_edge(unified_source, s, capacity=val)
-        total_supply += val
+    names = g2.names + ["__source__"]
+    src_id, sink_id = len(g2.names), g2.name2id[g2.sink]
+    source_ids = np.fromiter((g2.name2id[s] for s in g2.sources), dtype=np.int32, count=len(g2.sources))
+    supply = np.fromiter(g2.sources.values(), dtype=float, count=len(g2.sources))
+    us, vs, caps = append_edges(g2.u_ids, g2.v_ids, g2.hi, np.full(len(supply), src_id), source_ids, supply)
+    total_supply = float(supply.sum())
 
     try:
-        fval, fdict = nx.maximum_flow(flow, unified_source, g2.sink)
-    except nx.NetworkXError as e:
+        fval, flows = max_flow(len(names), us, vs, caps, src_id, sink_id)
+    except ValueError as e:
         return {"status": "error", "message": f"Flow computation failed: {e}"}
 
     if abs(fval - total_supply) > EPS:
         try:
-            cut_val, (reach, nonreach) = nx.minimum_cut(flow, unified_source, g2.sink)
-            reach = [n for n in reach if n != unified_source]
-            tight = []
-            for u in reach:
-                for v in nonreach:
-                    if flow.has_edge(u, v):
-                        cap = flow[u][v]["capacity"]
-                        if abs(fdict.get(u, {}).get(v, 0) - cap) < EPS:
-                            u_clean = u.replace("_out", "")
-                            v_clean = v.replace("_in", "")
-                            tight.append({"from": u_clean, "to": v_clean, "capacity": round(cap, 4)})
+            reach = [n for n in min_cut_source_side(len(names), us, vs, caps, flows, sink_id) if n != src_id]
+            cut_reachable, tight = cut_certificate(names, us, vs, caps, flows, reach)
             return {
                 "status": "infeasible",
-                "cut_reachable": sorted(reach),
+                "cut_reachable": cut_reachable,
                 "deficit": {"demand_balance": round(total_supply - fval, 4), "tight_edges": tight}
             }
         except Exception:
             return {"status": "infeasible", "message": "Could not achieve full source-sink flow"}
 
+    # Only the input edges are reported; they occupy the first len(base.lo) slots,
+    # in the (from, to) order established by parse_input.
     results = []
-    for u in fdict:
-        if u == unified_source:
+    for (u, v), flow_val, lo in zip(base.edges(), flows[:len(base.lo)].tolist(), base.lo.tolist()):
+        if abs(flow_val) < EPS:
             continue
-        for v, flow_val in fdict[u].items():
-            if abs(flow_val) < EPS:
-                continue
-            u_base, v_base = u.replace("_out", ""), v.replace("_in", "")
-            if (u_base, v_base) in g.orig_edges:
-                lo = g.orig_edges[(u_base, v_base)]["lo"]
-            else:
-                lo = 0
-            results.append({"from": u_base, "to": v_base, "flow": round(flow_val + lo, 4)})
-
-    results.sort(key=lambda e: (e["from"], e["to"]))
+        results.append({"from": u, "to": v, "flow": round(flow_val + lo, 4)})
+
     return {"status": "ok", "max_flow_per_min": round(fval, 4), "flows": results}
 
 
+def read_json() -> Any:
+    """
+    Parse the JSON document on stdin, with orjson's C parser when available.
+
+    orjson rejects the `NaN` and `Infinity` literals that json accepts, so a
+    document orjson refuses is parsed again with json before giving up.
+    """
+    data = sys.stdin.buffer.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def write_json(obj: Any, sort_keys: bool = False):
+    """
+    Write `obj` to stdout as 2-space indented UTF-8 JSON followed by a newline.
+
+    Both codecs write non-ASCII names unescaped. Float spelling can still differ
+    between them in the exponent (orjson writes `1e-7`, json writes `1e-07`), and
+    orjson writes non-finite floats as `null` where json writes `NaN`/`Infinity`.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        data = orjson.dumps(obj, option=option)
+    else:
+        data = (json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False) + "\n").encode("utf-8")
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
 def main():
     """Command-line entrypoint: read JSON from stdin, solve, and print result."""
     try:
-        data = json.load(sys.stdin)
+        data = read_json()
         if not isinstance(data, dict):
             raise ValueError("Input must be a JSON object")
 
         res = solve_belts(data)
-        json.dump(res, sys.stdout, indent=2, sort_keys=True)
-        sys.stdout.write("\n")
+        write_json(res, sort_keys=True)
 
     except json.JSONDecodeError as e:
-        json.dump({"status": "error", "message": f"Invalid JSON: {e}"}, sys.stdout, indent=2)
-        sys.stdout.write("\n")
+        write_json({"status": "error", "message": f"Invalid JSON: {e}"})
         sys.exit(1)
     except Exception as e:
-        json.dump({"status": "error", "message": str(e)}, sys.stdout, indent=2)
-        sys.stdout.write("\n")
+        write_json({"status": "error", "message": str(e)})
         sys.exit(1)
 
 
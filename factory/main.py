@@ -6,21 +6,99 @@ Reads a structured JSON input describing machines, recipes, modules, limits,
 and target outputs, and computes a feasible steady-state production plan.
 
 Implements:
-  - Linear programming formulation for balance equations
+  - Linear programming formulation for balance equations (SciPy HiGHS backend)
   - Module-driven machine speed and productivity adjustments
   - Capacity and supply constraints for raw materials and machines
-  - Binary search for determining maximum feasible production rate
+  - Two-phase LP for determining maximum feasible production rate
 """
 
 import sys
 import json
-import pulp
-from typing import Dict, Any, Set, Tuple
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix, csr_matrix, vstack
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+try:  # optional C JSON codec for stdin/stdout
+    import orjson
+except ImportError:
+    orjson = None
 
 EPS = 1e-9  # numerical precision tolerance
+LP_TIME_LIMIT = 2  # seconds per HiGHS solve
+HINT_TOL = 1e-6  # relative tolerance for a limit to count as binding
+
+
+class RecipeIndex:
+    """
+    Array-backed view of the recipe table, built in a single pre-pass.
 
+    Item names are interned into contiguous ids (`items_index`), per-recipe
+    machine parameters and module bonuses are stored as NumPy arrays aligned
+    with `recipe_names`, and recipe inputs/outputs are stored as CSR rows
+    (`*_indptr`, `*_indices`, `*_coef`) over item ids.
+    """
 
-def classify_materials(recipes: Dict[str, Any], target: str) -> Tuple[Set[str], Set[str]]:
+    def __init__(self, recipes: Dict[str, Any], machines: Dict[str, Any], modules: Dict[str, Any]):
+        self.recipe_names: List[str] = list(recipes)
+        self.items: List[str] = []
+        self.items_index: Dict[str, int] = {}
+
+        self.recipe_machine: List[str] = [rec["machine"] for rec in recipes.values()]
+        self.machine_names: List[str] = list(dict.fromkeys(self.recipe_machine))
+        machine_id = {m: i for i, m in enumerate(self.machine_names)}
+        self.recipe_machine_id = np.array([machine_id[m] for m in self.recipe_machine], dtype=np.int64)
+        self.recipes_of_machine: Dict[str, List[int]] = {m: [] for m in self.machine_names}
+        for r, m in enumerate(self.recipe_machine):
+            self.recipes_of_machine[m].append(r)
+
+        # Per-machine parameters, gathered per recipe
+        base_rate = np.array([machines[m]["crafts_per_min"] for m in self.machine_names], dtype=float)
+        speed = np.array([modules.get(m, {}).get("speed", 0.0) for m in self.machine_names], dtype=float)
+        prod = np.array([modules.get(m, {}).get("prod", 0.0) for m in self.machine_names], dtype=float)
+        self.base_rate = base_rate[self.recipe_machine_id]
+        self.speed_bonus = speed[self.recipe_machine_id]
+        self.prod_bonus = prod[self.recipe_machine_id]
+        self.time_s = np.array([rec["time_s"] for rec in recipes.values()], dtype=float)
+
+        self.in_indptr, self.in_indices, self.in_coef = self._csr(rec.get("in", {}) for rec in recipes.values())
+        self.out_indptr, self.out_indices, self.out_coef = self._csr(rec.get("out", {}) for rec in recipes.values())
+
+        # Recipe id of every CSR entry
+        self.in_rows = np.repeat(np.arange(len(self.recipe_names)), np.diff(self.in_indptr))
+        self.out_rows = np.repeat(np.arange(len(self.recipe_names)), np.diff(self.out_indptr))
+
+    def _intern(self, item: str) -> int:
+        if item not in self.items_index:
+            self.items_index[item] = len(self.items)
+            self.items.append(item)
+        return self.items_index[item]
+
+    def _csr(self, rows) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pack an iterable of {item: coef} rows into CSR arrays over item ids."""
+        indptr, indices, coef = [0], [], []
+        for row in rows:
+            for item, c in row.items():
+                indices.append(self._intern(item))
+                coef.append(c)
+            indptr.append(len(indices))
+        return (np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                np.array(coef, dtype=float))
+
+    def net_matrix(self, prod_mult: np.ndarray, extra_cols: int = 0) -> csr_matrix:
+        """
+        Items x recipes matrix of net production per craft: outputs scaled by the
+        recipe's productivity multiplier, minus inputs. `extra_cols` appends empty
+        columns for additional LP variables.
+        """
+        rows = np.concatenate((self.out_indices, self.in_indices))
+        cols = np.concatenate((self.out_rows, self.in_rows))
+        coef = np.concatenate((self.out_coef * prod_mult[self.out_rows], -self.in_coef))
+        shape = (len(self.items), len(self.recipe_names) + extra_cols)
+        return coo_matrix((coef, (rows, cols)), shape=shape).tocsr()
+
+
+def classify_materials(index: RecipeIndex, target: str) -> Tuple[Set[str], Set[str]]:
     """
     Identify which items are raw, intermediate, or final.
 
@@ -28,105 +106,140 @@ def classify_materials(recipes: Dict[str, Any], target: str) -> Tuple[Set[str],
     Intermediate materials are produced and consumed internally.
     The target item is the final output of interest.
     """
-    produced, consumed = set(), set()
-    for rec in recipes.values():
-        produced |= set(rec.get("out", {}).keys())
-        consumed |= set(rec.get("in", {}).keys())
-
-    raw_items = consumed - produced
-    intermediates = (produced | consumed) - raw_items - {target}
+    produced = np.zeros(len(index.items), dtype=bool)
+    consumed = np.zeros(len(index.items), dtype=bool)
+    produced[index.out_indices] = True
+    consumed[index.in_indices] = True
+
+    raw_mask = consumed & ~produced
+    raw_items = {index.items[i] for i in np.flatnonzero(raw_mask).tolist()}
+    intermediates = {index.items[i] for i in np.flatnonzero(~raw_mask).tolist()} - {target}
     return raw_items, intermediates
 
 
-def compute_recipe_speeds(recipes: Dict[str, Any],
-                          machines: Dict[str, Any],
-                          modules: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+def compute_recipe_speeds(index: RecipeIndex) -> Dict[str, Dict[str, float]]:
     """
     Compute the effective processing rates and productivity multipliers
     for all recipes given machine parameters and module bonuses.
 
     eff_rate = base_rate * (1 + speed_bonus) * 60 / time_s
     prod_mult = 1 + prod_bonus
+
+    The reciprocal `inv_eff_rate` (machines per craft/min) is stored as well so
+    downstream code multiplies instead of dividing.
+    """
+    with np.errstate(divide="raise"):
+        eff_rate = index.base_rate * (1 + index.speed_bonus) * 60 / index.time_s
+        inv_eff_rate = 1.0 / eff_rate
+    prod_mult = 1 + index.prod_bonus
+
+    return {
+        rname: {"machine": mtype, "eff_rate": rate, "inv_eff_rate": inv, "prod_mult": mult}
+        for rname, mtype, rate, inv, mult in zip(index.recipe_names, index.recipe_machine, eff_rate.tolist(),
+                                                 inv_eff_rate.tolist(), prod_mult.tolist())
+    }
+
+
+class ProductionLP:
     """
-    effective = {}
-    for rname, rec in recipes.items():
-        mtype = rec["machine"]
-        base_rate = machines[mtype]["crafts_per_min"]
-        time_s = rec["time_s"]
+    Sparse matrix form of the steady-state factory LP, solved with SciPy's HiGHS.
 
-        mod = modules.get(mtype, {})
-        speed_bonus = mod.get("speed", 0.0)
-        prod_bonus = mod.get("prod", 0.0)
+    Columns are the per-recipe craft rates followed by a single target-rate
+    column t; `load` holds each recipe's machine usage per craft/min.
+    """
 
-        eff_rate = base_rate * (1 + speed_bonus) * 60 / time_s
-        effective[rname] = {
-            "machine": mtype,
-            "eff_rate": eff_rate,
-            "prod_mult": 1 + prod_bonus
-        }
+    def __init__(self, load: np.ndarray, A_ub: csr_matrix, b_ub: np.ndarray,
+                 A_eq: csr_matrix, b_eq: np.ndarray):
+        self.load = load
+        self.A_ub, self.b_ub = A_ub, b_ub
+        self.A_eq, self.b_eq = A_eq, b_eq
 
-    return effective
+    def solve(self, c: np.ndarray, t_bounds: Tuple[float, float]) -> Optional[np.ndarray]:
+        """Minimize c over the constraints with t in `t_bounds`; None unless optimal."""
+        has_ub, has_eq = self.A_ub.shape[0] > 0, self.A_eq.shape[0] > 0
+        bounds = [(0, None)] * len(self.load) + [t_bounds]
+        res = linprog(c,
+                      A_ub=self.A_ub if has_ub else None, b_ub=self.b_ub if has_ub else None,
+                      A_eq=self.A_eq if has_eq else None, b_eq=self.b_eq if has_eq else None,
+                      bounds=bounds, method="highs", options={"time_limit": LP_TIME_LIMIT})
+        return res.x if res.status == 0 else None
 
 
-def solve_production_lp(recipes: Dict[str, Any],
+def build_production_lp(index: RecipeIndex,
                         eff: Dict[str, Any],
                         raw: Set[str],
                         inter: Set[str],
                         target_item: str,
-                        target_rate: float,
-                        limits: Dict[str, Any]) -> Dict[str, Any]:
+                        limits: Dict[str, Any]) -> ProductionLP:
     """
-    Formulate and solve the linear program representing the steady-state factory.
+    Formulate the steady-state factory constraints as sparse matrices.
 
-    The LP minimizes total machine load while ensuring:
+    The model enforces:
       - Material conservation across all items
       - Machine count and raw supply constraints
-      - Target item is produced at required rate
+      - Target item is produced at rate t (the last LP column)
     """
-    model = pulp.LpProblem("FactorySteadyState", pulp.LpMinimize)
-
-    # Decision variables: production rate per recipe (crafts per minute)
-    x = {r: pulp.LpVariable(f"x_{r}", lowBound=0) for r in recipes}
-
-    # Objective: minimize total machine usage
-    model += pulp.lpSum(x[r] / eff[r]["eff_rate"] for r in recipes)
-
-    # Collect all items appearing in recipes
-    all_items = {i for rec in recipes.values() for i in rec.get("in", {}).keys() | rec.get("out", {}).keys()}
-
-    # Flow balance equations
-    for item in all_items:
-        produced = pulp.lpSum(x[r] * rec.get("out", {}).get(item, 0) * eff[r]["prod_mult"]
-                              for r, rec in recipes.items())
-        consumed = pulp.lpSum(x[r] * rec.get("in", {}).get(item, 0)
-                              for r, rec in recipes.items())
-        net = produced - consumed
-
-        if item == target_item:
-            model += net == target_rate
-        elif item in inter:
-            model += net == 0
+    recipes = index.recipe_names
+    n = len(recipes)
+
+    # Total machine usage per craft/min of each recipe
+    load = np.array([eff[r]["inv_eff_rate"] for r in recipes], dtype=float)
+
+    # Flow balance equations: net production per item, plus the t column
+    prod_mult = np.array([eff[r]["prod_mult"] for r in recipes], dtype=float)
+    net = index.net_matrix(prod_mult, extra_cols=1).tolil()
+    if target_item in index.items_index:
+        net[index.items_index[target_item], n] = -1.0
+    net = net.tocsr()
+
+    eq_rows, raw_rows, cap_rows, caps = [], [], [], []
+    raw_caps = limits.get("raw_supply_per_min", {})
+    for i, item in enumerate(index.items):
+        if item == target_item or item in inter:
+            eq_rows.append(i)
         elif item in raw:
-            model += net <= 0
-            cap = limits.get("raw_supply_per_min", {}).get(item, float("inf"))
+            raw_rows.append(i)
+            cap = raw_caps.get(item, float("inf"))
             if cap < float("inf"):
-                model += -net <= cap
+                cap_rows.append(i)
+                caps.append(cap)
 
     # Machine capacity constraints
-    for mtype, cap in limits.get("max_machines", {}).items():
-        load = pulp.lpSum(x[r] / eff[r]["eff_rate"] for r in recipes if eff[r]["machine"] == mtype)
-        model += load <= cap
-
-    solver = pulp.PULP_CBC_CMD(msg=0, timeLimit=2)
-    status = model.solve(solver)
+    mach_rows, mach_cols, mach_coef, mach_caps = [], [], [], []
+    for k, (mtype, cap) in enumerate(limits.get("max_machines", {}).items()):
+        cols = index.recipes_of_machine.get(mtype, [])
+        mach_rows += [k] * len(cols)
+        mach_cols += cols
+        mach_coef += load[cols].tolist()
+        mach_caps.append(cap)
+    machine = coo_matrix((mach_coef, (mach_rows, mach_cols)), shape=(len(mach_caps), n + 1))
+
+    A_ub = vstack([net[raw_rows], -net[cap_rows], machine], format="csr")
+    b_ub = np.concatenate((np.zeros(len(raw_rows)), np.asarray(caps, dtype=float),
+                           np.asarray(mach_caps, dtype=float)))
+    A_eq = net[eq_rows]
+    return ProductionLP(load, A_ub, b_ub, A_eq, np.zeros(len(eq_rows)))
+
+
+def solve_production_lp(lp: ProductionLP,
+                        index: RecipeIndex,
+                        eff: Dict[str, Any],
+                        raw: Set[str],
+                        target_rate: float) -> Dict[str, Any]:
+    """
+    Solve the factory LP with the target produced at exactly `target_rate`.
 
-    if status == pulp.LpStatusOptimal:
-        return extract_solution(x, recipes, eff, raw)
+    The LP minimizes total machine load subject to the constraints of
+    `build_production_lp`.
+    """
+    sol = lp.solve(np.append(lp.load, 0.0), (target_rate, target_rate))
+    if sol is not None:
+        return extract_solution(sol[:-1], index, eff, raw)
     return {"status": "infeasible"}
 
 
-def extract_solution(xvars: Dict[str, pulp.LpVariable],
-                     recipes: Dict[str, Any],
+def extract_solution(rates: np.ndarray,
+                     index: RecipeIndex,
                      eff: Dict[str, Any],
                      raw: Set[str]) -> Dict[str, Any]:
     """
@@ -135,19 +248,23 @@ def extract_solution(xvars: Dict[str, pulp.LpVariable],
       - per-machine type count
       - raw consumption rates
     """
-    per_recipe = {r: round(max(0.0, v.varValue or 0.0), 6) for r, v in xvars.items()}
+    per_recipe = {r: round(max(0.0, v), 6) for r, v in zip(index.recipe_names, rates.tolist())}
 
     per_machine = {}
     for r, rate in per_recipe.items():
         mtype = eff[r]["machine"]
-        used = rate / eff[r]["eff_rate"]
+        used = rate * eff[r]["inv_eff_rate"]
         per_machine[mtype] = per_machine.get(mtype, 0.0) + used
 
     per_machine = {m: round(v, 6) for m, v in per_machine.items()}
 
+    rates = np.array([per_recipe[r] for r in index.recipe_names], dtype=float)
+    consumption = np.bincount(index.in_indices, weights=rates[index.in_rows] * index.in_coef,
+                              minlength=len(index.items))
+
     raw_use = {}
     for item in raw:
-        total = sum(per_recipe[r] * recipes[r].get("in", {}).get(item, 0) for r in recipes)
+        total = float(consumption[index.items_index[item]])
         if total > EPS:
             raw_use[item] = round(total, 6)
 
@@ -159,35 +276,36 @@ def extract_solution(xvars: Dict[str, pulp.LpVariable],
     }
 
 
-def search_max_rate(recipes, eff, raw, inter, tgt, goal_rate, limits):
+def search_max_rate(lp, index, eff, raw, goal_rate, limits):
     """
-    If the requested target rate is infeasible, use binary search to 
-    determine the maximum feasible production rate within tolerance.
+    If the requested target rate is infeasible, determine the maximum feasible
+    production rate with two solves over the same constraint matrices: first
+    the target-rate column t is relaxed to [0, goal_rate] and maximized on its
+    own, then total machine load is minimized with t pinned to that maximum.
     """
-    low, high = 0.0, goal_rate
-    best = None
+    sol = lp.solve(np.append(np.zeros(len(lp.load)), -1.0), (0, goal_rate))
 
-    while high - low > EPS:
-        mid = (low + high) / 2
-        res = solve_production_lp(recipes, eff, raw, inter, tgt, mid, limits)
-        if res["status"] == "ok":
-            best = res
-            low = mid
-        else:
-            high = mid
+    low, best = 0.0, None
+    if sol is not None:
+        low = max(0.0, float(sol[-1]))
+        best = solve_production_lp(lp, index, eff, raw, low)
+        if best["status"] != "ok":
+            best = extract_solution(sol[:-1], index, eff, raw)
 
     hints = []
     if best:
         used = best["per_machine_counts"]
         caps = limits.get("max_machines", {})
         for m, val in used.items():
-            if abs(val - caps.get(m, float("inf"))) < 1e-6:
+            cap = caps.get(m, float("inf"))
+            if abs(val - cap) < HINT_TOL * max(1.0, cap):
                 hints.append(f"{m} cap")
 
         cons = best["raw_consumption_per_min"]
         raw_caps = limits.get("raw_supply_per_min", {})
         for i, val in cons.items():
-            if abs(val - raw_caps.get(i, float("inf"))) < 1e-6:
+            cap = raw_caps.get(i, float("inf"))
+            if abs(val - cap) < HINT_TOL * max(1.0, cap):
                 hints.append(f"{i} supply")
 
     return {
@@ -213,25 +331,57 @@ def solve_factory(data: Dict[str, Any]) -> Dict[str, Any]:
     tgt_item = target["item"]
     tgt_rate = target["rate_per_min"]
 
-    raw, inter = classify_materials(recipes, tgt_item)
-    eff = compute_recipe_speeds(recipes, machines, modules)
+    index = RecipeIndex(recipes, machines, modules)
+    raw, inter = classify_materials(index, tgt_item)
+    eff = compute_recipe_speeds(index)
+
+    # Build the constraint matrices once; the target rate column is pinned to
+    # the goal and only relaxed if that turns out to be infeasible.
+    lp = build_production_lp(index, eff, raw, inter, tgt_item, limits)
 
-    result = solve_production_lp(recipes, eff, raw, inter, tgt_item, tgt_rate, limits)
+    result = solve_production_lp(lp, index, eff, raw, tgt_rate)
     if result["status"] == "ok":
         return result
-    return search_max_rate(recipes, eff, raw, inter, tgt_item, tgt_rate, limits)
+    return search_max_rate(lp, index, eff, raw, tgt_rate, limits)
+
+
+def read_json() -> Any:
+    """
+    Parse the JSON document on stdin, with orjson's C parser when available.
+
+    orjson rejects the `NaN` and `Infinity` literals that json accepts, so a
+    document orjson refuses is parsed again with json before giving up.
+    """
+    data = sys.stdin.buffer.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def write_json(obj: Any, sort_keys: bool = False):
+    """Write `obj` to stdout as JSON; same output contract as belts/main.py's write_json."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        data = orjson.dumps(obj, option=option)
+    else:
+        data = (json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False) + "\n").encode("utf-8")
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
 
 
 def main():
     """Entry point: read from stdin, solve, and output formatted JSON."""
     try:
-        data = json.load(sys.stdin)
+        data = read_json()
         result = solve_factory(data)
-        json.dump(result, sys.stdout, indent=2, sort_keys=True)
-        sys.stdout.write("\n")
+        write_json(result, sort_keys=True)
     except Exception as e:
-        json.dump({"status": "error", "message": str(e)}, sys.stdout, indent=2)
-        sys.stdout.write("\n")
+        write_json({"status": "error", "message": str(e)})
 
 
 if __name__ == "__main__":
@@ -7,12 +7,14 @@ import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
 
 def run_tests():
-    base = Path(__file__).resolve().parent
     tests = [
-        base / "test_factory.py",
-        base / "test_belts.py",
+        ROOT / "tests" / "test_factory.py",
+        ROOT / "tests" / "test_belts.py",
     ]
     for t in tests:
         print(f"\n Running {t.name}...")
@@ -24,8 +26,10 @@ def run_tests():
 
 
 def run_sample_solvers():
-    """Optional quick demonstration of both solvers with minimal sample inputs."""
+    """Optional quick demonstration of both solvers with minimal sample inputs, run in-process."""
     import json
+    from belts.main import solve_belts
+    from factory.main import solve_factory
 
     factory_input = {
         "machines": {"asm": {"crafts_per_min": 60}},
@@ -48,22 +52,10 @@ def run_sample_solvers():
     }
 
     print("\n Running Factory Solver...")
-    proc1 = subprocess.run(
-        [sys.executable, str(Path(__file__).parent.parent / "factory" / "main.py")],
-        input=json.dumps(factory_input),
-        text=True,
-        capture_output=True,
-    )
-    print(proc1.stdout)
+    print(json.dumps(solve_factory(factory_input), indent=2, sort_keys=True))
 
     print("\n Running Belts Solver...")
-    proc2 = subprocess.run(
-        [sys.executable, str(Path(__file__).parent.parent / "belts" / "main.py")],
-        input=json.dumps(belts_input),
-        text=True,
-        capture_output=True,
-    )
-    print(proc2.stdout)
+    print(json.dumps(solve_belts(belts_input), indent=2, sort_keys=True))
 
 
 if __name__ == "__main__":
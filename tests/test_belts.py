@@ -8,10 +8,18 @@ import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
+import pytest
 
-def execute_belts(data):
-    """Run the belts solver and capture its output."""
-    solver = Path(__file__).resolve().parent.parent / "belts" / "main.py"
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from belts.main import augment_flows, dinic_flows, push_relabel_flows, solve_belts  # noqa: E402
+
+
+def run_cli(data):
+    """Run the belts solver as a subprocess and capture its output."""
+    solver = ROOT / "belts" / "main.py"
     proc = subprocess.run(
         [sys.executable, str(solver)],
         input=json.dumps(data),
@@ -23,6 +31,11 @@ def execute_belts(data):
     return json.loads(proc.stdout), proc.returncode
 
 
+def execute_belts(data):
+    """Run the belts solver in-process (no interpreter startup per case)."""
+    return json.loads(json.dumps(solve_belts(data)))
+
+
 def test_basic_flow():
     """Feasible single-path flow test."""
     data = {
@@ -35,10 +48,11 @@ def test_basic_flow():
         "sink": "C"
     }
 
-    output, _ = execute_belts(data)
+    output = execute_belts(data)
     assert output["status"] == "ok"
     assert abs(output["max_flow_per_min"] - 50) < 1e-9
     assert len(output["flows"]) == 2
+    assert all(abs(e["flow"] - 50) < 1e-9 for e in output["flows"])
 
 
 def test_infeasible_lower():
@@ -50,7 +64,7 @@ def test_infeasible_lower():
         "sink": "B"
     }
 
-    output, _ = execute_belts(data)
+    output = execute_belts(data)
     assert output["status"] == "infeasible"
 
 
@@ -70,8 +84,96 @@ def test_capacity_limit():
         "sink": "C"
     }
 
-    output, _ = execute_belts(data)
+    output = execute_belts(data)
+    assert output["status"] == "infeasible"
+
+
+def test_node_cap_certificate():
+    """A binding node cap is reported as the node's internal in -> out edge."""
+    data = {
+        "edges": [
+            {"from": "A", "to": "B", "lower_bound": 0, "capacity": 100},
+            {"from": "B", "to": "C", "lower_bound": 0, "capacity": 100}
+        ],
+        "node_caps": {"B": 25},
+        "sources": [{"node": "A", "supply": 50}],
+        "sink": "C"
+    }
+
+    output = execute_belts(data)
     assert output["status"] == "infeasible"
+    assert output["cut_reachable"] == ["A", "B_in"]
+    assert output["deficit"]["demand_balance"] == 25
+    assert output["deficit"]["tight_edges"] == [{"from": "B_in", "to": "B_out", "capacity": 25}]
+
+
+def test_lower_bound_into_split_node():
+    """Lower bounds on edges entering a capped node are added back to their flow."""
+    data = {
+        "edges": [
+            {"from": "A", "to": "B", "lower_bound": 25, "capacity": 100},
+            {"from": "B", "to": "C", "lower_bound": 0, "capacity": 100},
+            {"from": "C", "to": "A", "lower_bound": 0, "capacity": 50}
+        ],
+        "node_caps": {"B": 30},
+        "sources": [{"node": "A", "supply": 20}],
+        "sink": "C"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "ok"
+    flows = {(e["from"], e["to"]): e["flow"] for e in output["flows"]}
+    assert flows[("A", "B")] >= 25
+
+
+def test_fractional_capacities():
+    """Capacities that are not exact in fixed point still carry the full supply."""
+    data = {
+        "edges": [{"from": "S", "to": f"X{i}", "lower_bound": 0, "capacity": 1 / 3} for i in range(3)]
+        + [{"from": f"X{i}", "to": "T", "lower_bound": 0, "capacity": 10} for i in range(3)],
+        "sources": [{"node": "S", "supply": 1}],
+        "sink": "T"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "ok"
+    assert abs(output["max_flow_per_min"] - 1) < 1e-9
+
+
+def test_mixed_magnitude_capacities():
+    """A huge capacity elsewhere in the network must not coarsen small ones."""
+    data = {
+        "edges": [
+            {"from": "S", "to": "A", "lower_bound": 0, "capacity": 5.25},
+            {"from": "S", "to": "B", "lower_bound": 0, "capacity": 5.25},
+            {"from": "A", "to": "T", "lower_bound": 0, "capacity": 1e8},
+            {"from": "B", "to": "T", "lower_bound": 0, "capacity": 100}
+        ],
+        "sources": [{"node": "S", "supply": 10.5}],
+        "sink": "T"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "ok"
+    assert abs(output["max_flow_per_min"] - 10.5) < 1e-9
+    assert all(abs(e["flow"] - 5.25) < 1e-9 for e in output["flows"])
+
+
+def test_large_supply_edge_flows():
+    """Edges wider than the total supply report the supply exactly, not a quantized value."""
+    data = {
+        "edges": [
+            {"from": "S", "to": "A", "lower_bound": 0, "capacity": 1e8},
+            {"from": "A", "to": "T", "lower_bound": 0, "capacity": 1e8},
+            {"from": "B", "to": "T", "lower_bound": 0, "capacity": 0.7}
+        ],
+        "sources": [{"node": "S", "supply": 2e6 / 3}],
+        "sink": "T"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "ok"
+    assert [e["flow"] for e in output["flows"]] == [output["max_flow_per_min"]] * 2
 
 
 def test_deterministic_output():
@@ -93,14 +195,143 @@ def test_deterministic_output():
         "sink": "D"
     }
 
-    runs = [execute_belts(data)[0] for _ in range(3)]
+    runs = [execute_belts(data) for _ in range(3)]
     baseline = json.dumps(runs[0], sort_keys=True)
     assert all(json.dumps(r, sort_keys=True) == baseline for r in runs)
 
 
+def test_common_capacity_unit():
+    """Capacities sharing a unit are solved in whole units and scaled back exactly."""
+    u_ids = np.array([0, 0, 1, 2], dtype=np.int32)
+    v_ids = np.array([1, 2, 3, 3], dtype=np.int32)
+    caps = np.array([2 / 3, 1 / 3, 1 / 3, np.inf])
+
+    flows = dinic_flows(4, u_ids, v_ids, caps, 0, 3)
+    assert flows.tolist() == [1 / 3, 1 / 3, 1 / 3, 1 / 3]
+
+
+def test_common_unit_shortfall():
+    """A shortfall of exactly one capacity unit is a real deficit, not rounding."""
+    data = {
+        "edges": [
+            {"from": "B", "to": "C", "lower_bound": 0, "capacity": 10},
+            {"from": "C", "to": "A", "lower_bound": 0, "capacity": 1}
+        ],
+        "sources": [{"node": "A", "supply": 1 / 3}, {"node": "B", "supply": 7}],
+        "sink": "C"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "infeasible"
+    assert output["deficit"]["demand_balance"] == 0.3333
+
+
+def test_large_fractional_capacity():
+    """A large capacity with a fractional part is not mistaken for a whole number."""
+    data = {
+        "edges": [{"from": "A", "to": "B", "lower_bound": 0, "capacity": 1e7}],
+        "sources": [{"node": "A", "supply": 1e7 + 0.005}],
+        "sink": "B"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "infeasible"
+    assert output["deficit"]["demand_balance"] == 0.005
+
+
+def test_many_rounded_capacities_shortfall():
+    """Rounding on many parallel edges cannot hide a shortfall smaller than the fixed-point step."""
+    width = 1000
+    edges = []
+    for i in range(width):
+        edges.append({"from": "S", "to": f"X{i}", "lower_bound": 0, "capacity": 1.0000001})
+        edges.append({"from": f"X{i}", "to": "T", "lower_bound": 0, "capacity": 10})
+    data = {"edges": edges, "sources": [{"node": "S", "supply": 1000.0009}], "sink": "T"}
+
+    output = execute_belts(data)
+    assert output["status"] == "infeasible"
+    assert output["deficit"]["demand_balance"] == 0.0008
+
+
+def test_huge_capacity_shortfall():
+    """A one-unit shortfall is found even where the fixed-point scale drops below one."""
+    data = {
+        "edges": [{"from": "A", "to": "B", "lower_bound": 0, "capacity": 3e9}],
+        "sources": [{"node": "A", "supply": 3e9 + 1}],
+        "sink": "B"
+    }
+
+    output = execute_belts(data)
+    assert output["status"] == "infeasible"
+    assert output["deficit"]["demand_balance"] == 1
+
+
+def test_push_relabel_matches_dinic():
+    """graph-tool's push-relabel backend agrees with SciPy's Dinic on a large network."""
+    pytest.importorskip("graph_tool")
+
+    rng = np.random.default_rng(0)
+    n = 200
+    pairs = np.unique(rng.integers(0, n, size=(3000, 2)), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    u_ids, v_ids = pairs[:, 0].astype(np.int32), pairs[:, 1].astype(np.int32)
+    caps = rng.integers(1, 60, size=len(pairs)) / 3
+
+    dinic = augment_flows(n, u_ids, v_ids, caps, dinic_flows(n, u_ids, v_ids, caps, 0, n - 1), 0, n - 1)
+    push = augment_flows(n, u_ids, v_ids, caps, push_relabel_flows(n, u_ids, v_ids, caps, 0, n - 1), 0, n - 1)
+
+    def value(flows):
+        return flows[u_ids == 0].sum() - flows[v_ids == 0].sum()
+
+    assert abs(value(dinic) - value(push)) < 1e-6
+    assert np.all(push <= caps)
+
+
+def test_cli_entrypoint():
+    """The command-line entry point reads stdin and writes the same JSON result."""
+    data = {
+        "edges": [
+            {"from": "A", "to": "B", "lower_bound": 0, "capacity": 100},
+            {"from": "B", "to": "C", "lower_bound": 0, "capacity": 100}
+        ],
+        "sources": [{"node": "A", "supply": 50}],
+        "sink": "C"
+    }
+
+    output, code = run_cli(data)
+    assert code == 0
+    assert output == execute_belts(data)
+
+
+def test_cli_infinite_capacity():
+    """The command-line entry point accepts the `Infinity` literal json writes for inf."""
+    data = {
+        "edges": [{"from": "A", "to": "B", "lower_bound": 0, "capacity": float("inf")}],
+        "sources": [{"node": "A", "supply": 50}],
+        "sink": "B"
+    }
+
+    output, code = run_cli(data)
+    assert code == 0
+    assert output == execute_belts(data)
+    assert output["max_flow_per_min"] == 50
+
+
 if __name__ == "__main__":
     test_basic_flow()
     test_infeasible_lower()
     test_capacity_limit()
+    test_node_cap_certificate()
+    test_lower_bound_into_split_node()
+    test_fractional_capacities()
+    test_mixed_magnitude_capacities()
+    test_large_supply_edge_flows()
     test_deterministic_output()
+    test_common_capacity_unit()
+    test_common_unit_shortfall()
+    test_large_fractional_capacity()
+    test_many_rounded_capacities_shortfall()
+    test_huge_capacity_shortfall()
+    test_cli_entrypoint()
+    test_cli_infinite_capacity()
     print("\n✅ Belts tests completed successfully.")
@@ -8,10 +8,15 @@ import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
 
-def execute_factory(data):
-    """Helper to run the factory solver and return (parsed_output, returncode)."""
-    solver = Path(__file__).resolve().parent.parent / "factory" / "main.py"
+from factory.main import solve_factory  # noqa: E402
+
+
+def run_cli(data):
+    """Helper to run the factory solver as a subprocess and return (parsed_output, returncode)."""
+    solver = ROOT / "factory" / "main.py"
     proc = subprocess.run(
         [sys.executable, str(solver)],
         input=json.dumps(data),
@@ -21,6 +26,15 @@ def execute_factory(data):
     return json.loads(proc.stdout), proc.returncode
 
 
+def execute_factory(data):
+    """Helper to run the factory solver in-process, mirroring the CLI's error handling."""
+    try:
+        result = solve_factory(data)
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+    return json.loads(json.dumps(result))
+
+
 def test_reference_case():
     """Validate solver output on standard sample input."""
     data = {
@@ -59,8 +73,7 @@ def test_reference_case():
         "target": {"item": "green_circuit", "rate_per_min": 1800}
     }
 
-    output, code = execute_factory(data)
-    assert code == 0
+    output = execute_factory(data)
     assert output["status"] == "ok"
     assert "per_recipe_crafts_per_min" in output
     assert "per_machine_counts" in output
@@ -108,13 +121,30 @@ def test_constraint_infeasible():
         "target": {"item": "green_circuit", "rate_per_min": 5000}
     }
 
-    output, code = execute_factory(data)
-    assert code == 0
+    output = execute_factory(data)
     assert output["status"] == "infeasible"
     assert output["max_feasible_target_per_min"] > 0
     assert len(output["bottleneck_hint"]) >= 1
 
 
+def test_max_rate_with_slow_machines():
+    """The maximum feasible rate is exact even when machine load per unit is huge."""
+    data = {
+        "machines": {"slow": {"crafts_per_min": 0.001}},
+        "recipes": {
+            "smelt": {"machine": "slow", "time_s": 100000, "in": {"ore": 1}, "out": {"plate": 1}}
+        },
+        "modules": {},
+        "limits": {"raw_supply_per_min": {"ore": 0.5}, "max_machines": {}},
+        "target": {"item": "plate", "rate_per_min": 1}
+    }
+
+    output = execute_factory(data)
+    assert output["status"] == "infeasible"
+    assert output["max_feasible_target_per_min"] == 0.5
+    assert output["bottleneck_hint"] == ["ore supply"]
+
+
 def test_empty_recipes():
     """Ensure missing recipes trigger graceful error."""
     data = {
@@ -125,7 +155,7 @@ def test_empty_recipes():
         "target": {"item": "ghost", "rate_per_min": 100}
     }
 
-    output, _ = execute_factory(data)
+    output = execute_factory(data)
     assert output["status"] == "error"
     assert "message" in output
 
@@ -150,14 +180,33 @@ def test_reproducibility():
         "target": {"item": "item_a", "rate_per_min": 100}
     }
 
-    results = [execute_factory(data)[0] for _ in range(3)]
+    results = [execute_factory(data) for _ in range(3)]
     ref = json.dumps(results[0], sort_keys=True)
     assert all(json.dumps(r, sort_keys=True) == ref for r in results)
 
 
+def test_cli_entrypoint():
+    """The command-line entry point reads stdin and writes the same JSON result."""
+    data = {
+        "machines": {"asm": {"crafts_per_min": 60}},
+        "recipes": {
+            "r1": {"machine": "asm", "time_s": 1.0, "in": {"raw": 1}, "out": {"item_a": 1}}
+        },
+        "modules": {},
+        "limits": {"raw_supply_per_min": {"raw": 1000}, "max_machines": {"asm": 100}},
+        "target": {"item": "item_a", "rate_per_min": 100}
+    }
+
+    output, code = run_cli(data)
+    assert code == 0
+    assert output == execute_factory(data)
+
+
 if __name__ == "__main__":
     test_reference_case()
     test_constraint_infeasible()
+    test_max_rate_with_slow_machines()
     test_empty_recipes()
     test_reproducibility()
+    test_cli_entrypoint()
     print("\n✅ Factory tests completed successfully.")